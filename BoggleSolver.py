@@ -1,42 +1,82 @@
-#!/usr/bin/env python
+#!/usr/bin/env python3
 
 """
 BoggleSolver solves Boggle boards.
 
-Python 2.7.13
+Python 3
 
 Command line arguments:
  python BoggleSolver.py <dictionary_filename> <board_filename> <output_filename>
 
 """
 
+import multiprocessing
 import os
+import re
+import string
 import sys
 
 # path to data directory for argument path handling
 DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
 
+# character codes for the 'qu' tile special case
+Q_CODE = ord('q')
+U_CODE = ord('u')
+# trie nodes have one child slot per letter, 'a' is slot 0
+A_CODE = ord('a')
+ALPHABET_SIZE = 26
+
+# dictionary words shared by every board, keyed by dictionary file path
+# each entry is (file modification time, 3 to 17 letter words joined by
+# newlines), one string lets each board filter every word in one regex pass
+_DICT_WORDS_CACHE = {}
+
+# translation table that lowercases board letters and deletes whitespace
+_BOARD_TRANS = str.maketrans(string.ascii_uppercase, string.ascii_lowercase,
+                             string.whitespace)
+
 
 def check_input_args(dict_arg, board_arg):
     """Check for input files in data folder if path not explicitly passed."""
     # if dict_arg is only the file name, try looking in data folder
     if not os.path.isfile(dict_arg):
-        try:
-            dict_arg = os.path.join(DATA_DIR, dict_arg)
-            assert os.path.isfile(dict_arg)
-        except AssertionError:
+        dict_arg = os.path.join(DATA_DIR, dict_arg)
+        if not os.path.isfile(dict_arg):
             raise IOError("Dictionary file not found.")
     # if board_arg is only the file name, try looking in data folder
     if not os.path.isfile(board_arg):
-        try:
-            board_arg = os.path.join(DATA_DIR, board_arg)
-            assert os.path.isfile(board_arg)
-        except AssertionError:
+        board_arg = os.path.join(DATA_DIR, board_arg)
+        if not os.path.isfile(board_arg):
             raise IOError("Board file not found.")
 
     return dict_arg, board_arg
 
 
+# board solved by a worker process, set once by _init_search_worker
+_search_board = None
+
+
+def _init_search_worker(board):
+    """Store the board to search in a worker process."""
+    global _search_board
+    _search_board = board
+
+
+def _search_from(start):
+    """Return found trie nodes from a start index using the worker's board."""
+    found = bytearray(len(_search_board.trie_words))
+    _search_board._search_from(start, found)
+    return found
+
+
+def _found_nodes(found):
+    """Yield the trie node ids marked in a found bytearray."""
+    node = found.find(b'\x01')
+    while node != -1:
+        yield node
+        node = found.find(b'\x01', node + 1)
+
+
 class BoggleBoard:
     """
     BoggleBoard class loads and solves a Boggle game, creating an output file.
@@ -59,18 +99,26 @@ class BoggleBoard:
         out_file:
             Output file to be create with alphabetized words found on the board.
 
+        processes:
+            Optional number of worker processes used to search the 16 start
+            indexes in parallel. The board is searched serially by default,
+            as starting worker processes costs more than a 4x4 search.
+
     """
 
-    possible_index_moves = {}
+    neighbors = ()
 
-    def __init__(self, dict_file, board_arg, out_file):
+    def __init__(self, dict_file, board_arg, out_file, processes=None):
         """Initialize the board data and run solve functions."""
         self.board = ""
-        self.valid_words = {}
+        self.board_bytes = bytearray()
+        self.trie_children = [0] * ALPHABET_SIZE
+        self.trie_words = [None]
         self.found_words = set()
         self.dict_file = dict_file
         self.board_arg = board_arg
         self.out_file = out_file
+        self.processes = processes
 
         self._build_possible_index_moves()
         self._load_board()
@@ -78,12 +126,12 @@ class BoggleBoard:
         self._solve_board()
 
     def _build_possible_index_moves(self):
-        """Build the class dict storing base moves for each board index."""
-        for i in range(0, 16):
-            self.possible_index_moves[i] = self._get_possible_index_moves(i)
+        """Build the tuple storing neighbor indices for each board index."""
+        self.neighbors = tuple(self._get_possible_index_moves(i)
+                               for i in range(0, 16))
 
     def _get_possible_index_moves(self, index):
-        """Return list of moves for a given Boggle Board index."""
+        """Return tuple of neighbor indices for a given Boggle Board index."""
         # list of all possible movement paths on a boggle board
         # based on the layout of the 4x4 matrix board in a 1 dimensional string
         possible_moves = (-5, -4, -3, -1, 1, 3, 4, 5)
@@ -100,13 +148,13 @@ class BoggleBoard:
         elif index % 4 == 3:
             index_moves.difference_update((-3, 1, 5))
         # if in the top row no upward moves
-        if index < 4 == 0:
+        if index < 4:
             index_moves.difference_update((-5, -4, -3))
         # if in the bottom row no downward moves
-        elif index > 11 == 3:
+        elif index > 11:
             index_moves.difference_update((3, 4, 5))
 
-        return index_moves
+        return tuple(sorted(index + move for move in index_moves))
 
     def _load_board(self):
         """Load board file to memory and sterilize data."""
@@ -116,116 +164,159 @@ class BoggleBoard:
         else:
             self.board = self.board_arg
 
-        self.board = self.board.lower()
-        self.board = "".join(self.board.split())
+        self.board = self.board.translate(_BOARD_TRANS)
 
         # validate that board input is a 16 letter string
-        assert (len(self.board) == 16 and isinstance(self.board, str) and
-                self.board.isalpha())
+        if not (len(self.board) == 16 and self.board.isascii() and
+                self.board.isalpha()):
+            raise ValueError("Board must be 16 letters.")
+
+        # character codes of the board letters, used to walk the trie
+        self.board_bytes = bytearray(self.board, 'ascii')
 
     def _load_dictionary(self):
         """Load dictionary file to memory and remove all invalid words."""
-        assert os.path.isfile(self.dict_file)
-        dict_words = []
-        with open(self.dict_file, 'r') as dictionary:
-            for line in dictionary:
-                word = line.strip()
-                # exclude words < 3 letters and words > 17 letters
-                if len(word) > 2 and len(word) < 18:
-                    dict_words.append(word)
-
-        alphabet = "abcdefghijklmnopqrstuvwxyz"
-        # find missing letters not present on board
-        missing_letters = [letter for letter in alphabet
-                           if letter not in self.board]
+        # reuse words read for a previous board unless the file has changed
+        dict_path = os.path.abspath(self.dict_file)
+        dict_mtime = os.path.getmtime(dict_path)
+        cached = _DICT_WORDS_CACHE.get(dict_path)
+        if cached is not None and cached[0] == dict_mtime:
+            dict_text = cached[1]
+        else:
+            dict_words = []
+            with open(dict_path, 'r') as dictionary:
+                for line in dictionary:
+                    word = line.strip()
+                    # exclude words < 3 letters and words > 17 letters
+                    if len(word) > 2 and len(word) < 18:
+                        dict_words.append(word)
+            dict_text = '\n'.join(dict_words)
+            _DICT_WORDS_CACHE[dict_path] = (dict_mtime, dict_text)
+
+        board_letters = set(self.board)
         # add special case for 'qu' words
-        if 'q' not in missing_letters and 'u' in missing_letters:
-            missing_letters.remove('u')
-        # create dict structure based on present letters only
-        present_letters = [letter for letter in alphabet
-                           if letter not in missing_letters]
-        # remove words containing any missing letters
-        remove_words = set()
-        for word in dict_words:
-            has_missing_letters = False
-            for letter in missing_letters:
-                if has_missing_letters:
-                    continue
-                if letter in word:
-                    has_missing_letters = True
-                    remove_words.add(word)
-        unsorted_valid_words = [word for word in dict_words
-                                if word not in remove_words]
-
-        # build a nested dict for valid words with their first 2 letters as keys
-        # ex. self.valid_words['a']['b'] returns ["abbey", about", "absent"]
-        for first_word_letter in present_letters:
-            self.valid_words[first_word_letter] = {}
-            for second_word_letter in present_letters:
-                self.valid_words[first_word_letter][second_word_letter] = []
-
-        for word in unsorted_valid_words:
-            self.valid_words[word[0]][word[1]].append(word)
+        if 'q' in board_letters:
+            board_letters.add('u')
+        # remove words containing any letters not present on board
+        # or longer than a path over every tile, each 'q' tile adds a 'u'
+        max_len = 16 + self.board.count('q')
+        valid_word_pattern = re.compile(
+            '^[%s]{3,%d}$' % ("".join(sorted(board_letters)), max_len), re.M)
+        valid_words = valid_word_pattern.findall(dict_text)
+
+        # remove words with a consecutive letter pair not on adjacent tiles
+        tile_letters = ['qu' if letter == 'q' else letter
+                        for letter in self.board]
+        adjacent_bigrams = set()
+        for i in range(0, 16):
+            if tile_letters[i] == 'qu':
+                adjacent_bigrams.add('qu')
+            for j in self.neighbors[i]:
+                adjacent_bigrams.add(tile_letters[i][-1] + tile_letters[j][0])
+        valid_words = [word for word in valid_words
+                       if all(word[k:k + 2] in adjacent_bigrams
+                              for k in range(len(word) - 1))]
+
+        # build a trie of valid words flattened into lists indexed by node id
+        # node 0 is the root, self.trie_children[node * 26 + letter] is the
+        # child node id for a letter index or 0 if there is no child (the root
+        # is never a child), self.trie_words[node] is the word ending at that
+        # node or None
+        trie_children = self.trie_children
+        trie_words = self.trie_words
+        for word in valid_words:
+            node = 0
+            for code in bytearray(word, 'ascii'):
+                slot = node * ALPHABET_SIZE + code - A_CODE
+                child = trie_children[slot]
+                if not child:
+                    child = len(trie_words)
+                    trie_children[slot] = child
+                    trie_children.extend([0] * ALPHABET_SIZE)
+                    trie_words.append(None)
+                node = child
+            trie_words[node] = word
 
     def _solve_board(self):
         """Solve the board and write sorted solution words to output file."""
+        # found words are marked by trie node id, found[node] is 1 once the
+        # word ending at node has been found
+        found = bytearray(len(self.trie_words))
         # for each board index, find words starting at that index
-        # all letters start recursive _find_words function unused
-        used_letter = [False] * 16
-        for i in range(0, 16):
-            self._find_words(i, used_letter, [])
+        # searches from each index are independent, so they may run in
+        # parallel worker processes
+        if self.processes is not None and self.processes > 1:
+            pool = multiprocessing.Pool(min(16, self.processes),
+                                        _init_search_worker, (self,))
+            try:
+                results = pool.map(_search_from, range(0, 16))
+            finally:
+                pool.close()
+                pool.join()
+            for result in results:
+                for node in _found_nodes(result):
+                    found[node] = 1
+        else:
+            for i in range(0, 16):
+                self._search_from(i, found)
+        self.found_words.update(self.trie_words[node]
+                                for node in _found_nodes(found))
 
-        # convert found word set to list and sort
-        out_words = sorted(list(self.found_words))
-        # write solution words to output file
+        # sort found words and write them to output file in one call
+        out_words = sorted(self.found_words)
         with open(self.out_file, 'w') as output:
-            for word in out_words:
-                output.write(word + '\n')
-
-    def _find_words(self, index, used_letter_arg, cur_path_arg):
-        """Find valid words on Boggle Board recursively."""
-        used_letter = [val for val in used_letter_arg]
-        # set current letter as used on board
-        used_letter[index] = True
-
-        cur_path = [val for val in cur_path_arg]
-        # add the current index to the path thus far
-        cur_path.append(index)
-
-        # test the current index's possible moves against the available letters
-        available_moves = [move for move in self.possible_index_moves[index]
-                           if not used_letter[index + move]]
-
-        is_word_start = False
-        if len(cur_path) == 1:
-            # all individual letters can start words
-            is_word_start = True
-        else:
-            cur_word = ""
-            for pos in cur_path:
-                cur_word += self.board[pos]
-                if self.board[pos] == 'q':
-                    cur_word += 'u'
-
-            for word in self.valid_words[cur_word[0]][cur_word[1]]:
-                if word.startswith(cur_word):
-                    is_word_start = True
-                    break
-
-            # add > 2 letter, valid words to found words
-            if len(cur_word) > 2:
-                if cur_word in self.valid_words[cur_word[0]][cur_word[1]]:
-                    self.found_words.add(cur_word)
-        # recursively call _find_words function on available moves from index
-        if is_word_start and available_moves:
-            for move in available_moves:
-                self._find_words(index + move, used_letter, cur_path)
+            if out_words:
+                output.write('\n'.join(out_words) + '\n')
+
+    def _search_from(self, start, found):
+        """Mark trie nodes of words found on paths beginning at start."""
+        # bind attributes to locals, the search below reads them at every step
+        neighbors = self.neighbors
+        trie_children = self.trie_children
+        trie_words = self.trie_words
+        alphabet_size = ALPHABET_SIZE
+        # letter index of each tile, used as the trie child slot
+        tiles = [code - A_CODE for code in self.board_bytes]
+        q_tile = Q_CODE - A_CODE
+        u_tile = U_CODE - A_CODE
+
+        tile = tiles[start]
+        node = trie_children[tile]
+        # 'q' tiles are played as 'qu'
+        if node and tile == q_tile:
+            node = trie_children[node * alphabet_size + u_tile]
+        if not node:
+            return
+
+        # depth first search with an explicit stack of paths to extend
+        # each path is (last index, used letters bitmask, trie node id)
+        stack = [(start, 1 << start, node)]
+        while stack:
+            index, used_letter, node = stack.pop()
+
+            # trie only holds > 2 letter words, so any word end is found
+            if trie_words[node] is not None:
+                found[node] = 1
+
+            # descend the trie for each available move, pruning moves whose
+            # letter does not continue any valid word
+            slots = node * alphabet_size
+            for neighbor in neighbors[index]:
+                if used_letter & (1 << neighbor):
+                    continue
+                tile = tiles[neighbor]
+                child = trie_children[slots + tile]
+                if child and tile == q_tile:
+                    child = trie_children[child * alphabet_size + u_tile]
+                if child:
+                    stack.append((neighbor, used_letter | (1 << neighbor),
+                                  child))
 
 
 if __name__ == '__main__':
     if len(sys.argv) != 4:
-        print "Usage: BoggleSolver " + \
-              "<dictionary_filename> <board_filename> <output_filename>"
+        print("Usage: BoggleSolver "
+              "<dictionary_filename> <board_filename> <output_filename>")
         sys.exit(1)
 
     dict_arg, board_arg, output_arg = sys.argv[1:]
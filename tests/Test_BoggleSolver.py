@@ -1,9 +1,9 @@
-#!/usr/bin/env python
+#!/usr/bin/env python3
 
 """
 Test_BoggleSolver runs unit tests on BoggleSolver.py.
 
-Python 2.7.13
+Python 3
 
 """
 
@@ -29,7 +29,7 @@ BOARD_2_SOL_FILE = os.path.join(DATA_DIR, "board_2_solution.txt")
 def read_file_to_string(text_file):
     """Read text file and return data as string."""
     output_string = ""
-    with open(text_file, 'rU') as text_file_open:
+    with open(text_file, 'r') as text_file_open:
         output_string = text_file_open.read()
     return output_string
 
@@ -37,7 +37,7 @@ def read_file_to_string(text_file):
 def read_lines_to_list(text_file):
     """Read text file lines and return data as word list."""
     output_list = []
-    with open(text_file, 'rU') as text_file_open:
+    with open(text_file, 'r') as text_file_open:
         for line in text_file_open.readlines():
             output_list.append(line)
     return output_list
@@ -69,6 +69,14 @@ class TestSampleBoards(unittest.TestCase):
         board_2_solution = read_file_to_string(BOARD_2_SOL_FILE)
         self.assertEqual(board_2_output, board_2_solution)
 
+    def test_processes(self):
+        """Validate board_1.txt solved in parallel equals the solution."""
+        output_file = "processes_test_output.txt"
+        BoggleBoard(DICT_FILE, BOARD_1_FILE, output_file, processes=4)
+        processes_output = read_file_to_string(output_file)
+        board_1_solution = read_file_to_string(BOARD_1_SOL_FILE)
+        self.assertEqual(processes_output, board_1_solution)
+
     def test_no_words(self):
         """Validate board with no words returns nothing."""
         all_x_board = "X" * 16
@@ -154,6 +162,64 @@ class TestOutputFiles(unittest.TestCase):
         self.assertEqual(board_1_output, board_1_output.lower())
 
 
+class TestDictionaryCache(unittest.TestCase):
+    """Test dictionary words are reused between boards."""
+
+    def tearDown(self):
+        """Cleanup temp output files."""
+        pattern = ".+_test_output.txt"
+        for f in os.listdir(CUR_DIR):
+            if re.search(pattern, f):
+                os.remove(os.path.join(CUR_DIR, f))
+
+    def test_changed_dictionary(self):
+        """Validate a dictionary file is read again after it changes."""
+        dict_file = "cache_dict_test_output.txt"
+        output_file = "cache_test_output.txt"
+        with open(dict_file, 'w') as dictionary:
+            dictionary.write("via\n")
+        os.utime(dict_file, (1000000000, 1000000000))
+        BoggleBoard(dict_file, "VVVVVVIAVVVVVVVV", output_file)
+        self.assertEqual(read_file_to_string(output_file), "via\n")
+
+        with open(dict_file, 'w') as dictionary:
+            dictionary.write("vav\n")
+        os.utime(dict_file, (1000000001, 1000000001))
+        BoggleBoard(dict_file, "VVVVVVIAVVVVVVVV", output_file)
+        self.assertEqual(read_file_to_string(output_file), "vav\n")
+
+
+class TestBoardMoves(unittest.TestCase):
+    """Test possible moves between board indexes."""
+
+    def tearDown(self):
+        """Cleanup temp output files."""
+        pattern = ".+_test_output.txt"
+        for f in os.listdir(CUR_DIR):
+            if re.search(pattern, f):
+                os.remove(os.path.join(CUR_DIR, f))
+
+    def test_neighbor_counts(self):
+        """Validate corners have 3 neighbors, edges 5 and interior 8."""
+        output_file = "board_1_test_output.txt"
+        board = BoggleBoard(DICT_FILE, BOARD_1_FILE, output_file)
+        neighbor_counts = [len(neighbors) for neighbors in board.neighbors]
+        self.assertEqual(neighbor_counts, [3, 5, 5, 3,
+                                           5, 8, 8, 5,
+                                           5, 8, 8, 5,
+                                           3, 5, 5, 3])
+
+    def test_neighbors_adjacent(self):
+        """Validate neighbors are adjacent and do not wrap around the board."""
+        output_file = "board_1_test_output.txt"
+        board = BoggleBoard(DICT_FILE, BOARD_1_FILE, output_file)
+        for index, neighbors in enumerate(board.neighbors):
+            for neighbor in neighbors:
+                self.assertNotEqual(index, neighbor)
+                self.assertTrue(abs(index // 4 - neighbor // 4) <= 1)
+                self.assertTrue(abs(index % 4 - neighbor % 4) <= 1)
+
+
 class TestInputFiles(unittest.TestCase):
     """Test invalid input files throw errors."""
 
@@ -167,6 +233,16 @@ class TestInputFiles(unittest.TestCase):
         self.assertRaises(IOError, check_input_args, DICT_FILE,
                           "bad_board_file.txt")
 
+    def test_bad_board_length(self):
+        """Validate error is thrown for a board without 16 letters."""
+        self.assertRaises(ValueError, BoggleBoard, DICT_FILE, "ABC",
+                          "bad_board_test_output.txt")
+
+    def test_bad_board_letters(self):
+        """Validate error is thrown for a board with non letter characters."""
+        self.assertRaises(ValueError, BoggleBoard, DICT_FILE,
+                          "ABCDEFGHIJKLMNO1", "bad_board_test_output.txt")
+
 
 if __name__ == "__main__":
     unittest.main()